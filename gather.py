@@ -1,6 +1,6 @@
 import pycurl
 from io import BytesIO
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 import sys
 from selenium import webdriver
 from selenium.webdriver.firefox.service import Service as FirefoxService
@@ -11,13 +11,72 @@ from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.firefox import GeckoDriverManager
 from selenium.common.exceptions import TimeoutException
 import time
+import gzip
+import hashlib
+import pathlib
 import re
+import queue
+import socket
+import ipaddress
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
+from urllib.parse import quote, urljoin, urlparse, urlsplit, urlunsplit
+from typing import Iterator
 
 URL = 'https://scholenopdekaart.nl/zoeken/basisscholen?zoektermen=Groningen&weergave=Lijst'
 TARGET_PUBLIC = "basisscholen/groningen"
 TARGET_INTERNATIONAL = "/in/"
 
 COUNTRY = 'Netherlands'
+CONCURRENCY = 20
+DRIVER_POOL_SIZE = 4
+CONTACT_PREFETCH = 4
+RETRIES = 3
+BACKOFF = 0.3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Fetched pages are kept on disk so reruns within CACHE_TTL seconds skip the network
+CACHE_DIR = pathlib.Path('.httpcache')
+CACHE_TTL = 86400
+
+# Share resolved hosts and TLS sessions between every pycurl handle for the whole run
+CURL_SHARE = pycurl.CurlShare()
+CURL_SHARE.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS)
+CURL_SHARE.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION)
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}")
+MAILTO_RE = re.compile(rb'mailto:([A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,})', re.IGNORECASE)
+# The href must be its own attribute (not data-href), may have spaces around '=' and may be unquoted,
+# quoted values of the attributes before it are skipped whole so a '>' or 'href=' inside them is ignored
+HREF_RE = re.compile(rb'<a\s(?:[^>"\']|"[^"]*"|\'[^\']*\')*?(?<=\s)href\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+# Characters left as they are when percent-encoding scraped URLs, '%' keeps existing escapes intact
+URL_SAFE_CHARS = "/?#[]@!$&'()*+,;=:%~"
+
+# Keywords deciding which addresses on a school's website are worth keeping
+CONTACT_WHITELIST = ('info', 'contact', 'dir', 'administration')
+CONTACT_BLACKLIST = ('recru', 'www', 'office')
+HOMEPAGE_BLACKLIST = ('recru', 'www')
+
+def contains_any(keywords: tuple[str, ...]) -> str:
+    """ Build an XPath predicate matching anchors whose lowercased href contains any of the keywords.
+
+    Args:
+        keywords (tuple[str, ...]): The keywords to look for.
+
+    Returns:
+        str: The XPath predicate.
+    """
+    href = "translate(@href, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+    return '(' + ' or '.join(f"contains({href}, '{keyword}')" for keyword in keywords) + ')'
+
+# XPath queries run inside lxml, so anchors are filtered without a Python call per tag
+INTERNATIONAL_LINKS_XPATH = etree.XPath("//div[@id='cities-schools']//h3[contains(concat(' ', normalize-space(@class), ' '), ' mb20 ')]/descendant::a[1]/@href")
+DATA_ID_LINKS_XPATH = etree.XPath("//*[@data-id]/@href")
+SCHOOL_WEBPAGE_XPATH = etree.XPath("(//a[@title=\"School's webpage\"])[1]/@href")
+CONTACT_LINKS_XPATH = etree.XPath("//a[contains(@href, 'contact')]/@href")
+CONTACT_EMAILS_XPATH = etree.XPath(f"//a[{contains_any(CONTACT_WHITELIST)} and not({contains_any(CONTACT_BLACKLIST)})]/@href")
+HOMEPAGE_EMAILS_XPATH = etree.XPath(f"//a[contains(@href, '@') and not({contains_any(HOMEPAGE_BLACKLIST)})]/@href")
+UTF8_PARSER = lxml_html.HTMLParser(encoding='utf-8')
 
 def init_driver(proxy=False) -> webdriver.Firefox:
     """ Initialize a Selenium webdriver for Firefox.
@@ -32,35 +91,259 @@ def init_driver(proxy=False) -> webdriver.Firefox:
         options.set_preference("network.proxy.socks_port", int(sys.argv[4]))
         options.set_preference("network.proxy.socks_version", 5)
     options.add_argument("--headless")  # This line enables headless mode
+    # Only the DOM is scraped, so skip downloading images, stylesheets and media
+    options.set_preference("permissions.default.image", 2)
+    options.set_preference("permissions.default.stylesheet", 2)
+    options.set_preference("media.autoplay.default", 5)
+    options.set_preference("gfx.downloadable_fonts.enabled", False)
+    options.set_preference("browser.display.use_document_fonts", 0)
+    # Pages are cached by the scraper itself, so don't spend time writing Firefox's disk cache
+    options.set_preference("browser.cache.disk.enable", False)
+    # Return from driver.get() once the DOM is ready instead of waiting for every subresource
+    options.page_load_strategy = 'eager'
     service = FirefoxService(executable_path=GeckoDriverManager().install())
     driver = webdriver.Firefox(service=service, options=options)
     driver.set_page_load_timeout(60)
     return driver
 
-def fetch_url_static(url: str, curl=None) -> tuple[str, pycurl.Curl]:
+def cache_path(url: str, kind: str) -> pathlib.Path:
+    """ Get the path a fetched page is cached under.
+
+    Args:
+        url (str): The URL of the page.
+        kind (str): How the page was fetched, since static and rendered content differ.
+
+    Returns:
+        pathlib.Path: The path of the cache file.
+    """
+    return CACHE_DIR / hashlib.sha1(f"{kind}:{url}".encode()).hexdigest()
+
+def read_cache(url: str, kind: str) -> bytes | None:
+    """ Read a page from the on-disk cache.
+
+    Args:
+        url (str): The URL of the page.
+        kind (str): How the page was fetched.
+
+    Returns:
+        bytes | None: The cached content, or None if it is missing, expired or unreadable.
+    """
+    path = cache_path(url, kind)
+    try:
+        if time.time() - path.stat().st_mtime < CACHE_TTL:
+            return gzip.decompress(path.read_bytes())
+    except (OSError, EOFError):
+        # Missing or partially written entries are simply fetched again
+        pass
+    return None
+
+def write_cache(url: str, kind: str, content: bytes) -> None:
+    """ Write a page to the on-disk cache, compressed.
+
+    Args:
+        url (str): The URL of the page.
+        kind (str): How the page was fetched.
+        content (bytes): The content of the page.
+    """
+    CACHE_DIR.mkdir(exist_ok=True)
+    cache_path(url, kind).write_bytes(gzip.compress(content))
+
+def init_curl(proxy=False, resolved=None) -> pycurl.Curl:
+    """ Initialize a pycurl object for static page fetches.
+
+    Args:
+        proxy (bool, optional): Whether to route requests through the SOCKS5 proxy given on the command line. Defaults to False.
+        resolved (list[str], optional): Hosts resolved ahead of time, as returned by preresolve_hosts. Defaults to None.
+
+    Returns:
+        pycurl.Curl: The pycurl object.
+    """
+    c = pycurl.Curl()
+    c.setopt(pycurl.SHARE, CURL_SHARE)
+    c.setopt(pycurl.DNS_CACHE_TIMEOUT, 600) # Sets DNS cache timeout
+    c.setopt(pycurl.TCP_KEEPALIVE, 1)
+    c.setopt(pycurl.TCP_NODELAY, 1)
+    c.setopt(pycurl.MAXCONNECTS, 32)
+    # Ask for every compression scheme libcurl can decode, it decompresses the body for us
+    c.setopt(pycurl.ACCEPT_ENCODING, "")
+    # Use HTTP/2 over TLS where the server supports it so transfers to one host share a connection
+    c.setopt(pycurl.HTTP_VERSION, pycurl.CURL_HTTP_VERSION_2TLS)
+    c.setopt(pycurl.SSL_VERIFYPEER, 0)
+    c.setopt(pycurl.SSL_VERIFYHOST, 0)
+    c.setopt(pycurl.USERAGENT, 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36')
+    if proxy:
+        c.setopt(pycurl.PROXY, f"socks5h://{sys.argv[3]}:{sys.argv[4]}")
+    elif resolved:
+        c.setopt(pycurl.RESOLVE, resolved)
+    return c
+
+def preresolve_hosts(urls) -> list[str]:
+    """ Resolves the hosts of several URLs concurrently, ahead of fetching them.
+
+    Args:
+        urls (Iterable[str]): The URLs whose hosts to resolve.
+
+    Returns:
+        list[str]: A "host:port:address" entry for every host that resolved, as expected by pycurl.RESOLVE.
+    """
+    targets = set()
+    for parsed in map(urlparse, urls):
+        if not parsed.hostname:
+            continue
+        try:
+            port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+            # Name the host the way absolute_url does, so the entry matches the URLs libcurl is given
+            host = parsed.hostname if parsed.hostname.isascii() else parsed.hostname.encode('idna').decode('ascii')
+        except (ValueError, UnicodeError):
+            # Skip malformed ports and host names that cannot be IDNA-encoded
+            continue
+        try:
+            # IP literals need no lookup
+            ipaddress.ip_address(host)
+        except ValueError:
+            targets.add((host, port))
+    def resolve(target):
+        host, port = target
+        try:
+            addresses = dict.fromkeys(info[4][0] for info in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM))
+        except (socket.gaierror, UnicodeError):
+            return None
+        # Pass every address along so libcurl can still fall back between IPv6 and IPv4
+        return f"{host}:{port}:" + ','.join(f"[{address}]" if ':' in address else address for address in addresses)
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        return [entry for entry in executor.map(resolve, targets) if entry]
+
+def fetch_url_static(url: str, curl=None, proxy=False) -> tuple[bytes, pycurl.Curl]:
     """ Fetches the page content of a URL using pycurl. Much faster for static pages.
 
     Args:
         url (str): The URL to fetch the content from.
         curl (pycurl.Curl, optional): The pycurl object to use. Defaults to None.
+        proxy (bool, optional): Whether a new pycurl object routes requests through the SOCKS5 proxy given on the command line. Defaults to False.
 
     Returns:
-        tuple[str, pycurl.Curl]: The content of the page and the pycurl object.
+        tuple[bytes, pycurl.Curl]: The raw content of the page and the pycurl object.
     """
-    if curl is None:
-        c = pycurl.Curl()
-        c.setopt(pycurl.DNS_CACHE_TIMEOUT, 60) # Sets DNS cache timeout
-        c.setopt(pycurl.TCP_KEEPALIVE, 1)
-        c.setopt(pycurl.SSL_VERIFYPEER, 0)
-        c.setopt(pycurl.SSL_VERIFYHOST, 0)
-        c.setopt(pycurl.USERAGENT, 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36')
-    else:
-        c = curl
-    buffer = BytesIO()
-    c.setopt(pycurl.URL, url)
-    c.setopt(pycurl.WRITEDATA, buffer)
-    c.perform()
-    return buffer.getvalue().decode('utf-8'), c
+    cached = read_cache(url, 'static')
+    if cached is not None:
+        return cached, curl
+    c = init_curl(proxy) if curl is None else curl
+    for attempt in range(RETRIES + 1):
+        # Let libcurl append straight into a growable buffer
+        buffer = bytearray()
+        c.setopt(pycurl.URL, url)
+        c.setopt(pycurl.WRITEFUNCTION, buffer.extend)
+        try:
+            c.perform()
+        except pycurl.error:
+            # Give up on connection errors once the retries run out
+            if attempt == RETRIES:
+                raise
+        else:
+            if attempt == RETRIES or c.getinfo(pycurl.RESPONSE_CODE) not in RETRY_STATUSES:
+                break
+        # Back off before retrying a transient failure
+        time.sleep(BACKOFF * 2 ** attempt)
+    content = bytes(buffer)
+    if c.getinfo(pycurl.RESPONSE_CODE) < 400:
+        write_cache(url, 'static', content)
+    return content, c
+
+def fetch_urls_static(urls, proxy=False, resolved=None) -> dict[str, bytes]:
+    """ Fetches the page content of several URLs concurrently using pycurl's multi interface.
+
+    URLs are pulled from `urls` only as handles become free, so a generator can keep producing links while
+    earlier pages are being fetched.
+
+    Args:
+        urls (Iterable[str]): The URLs to fetch the content from.
+        proxy (bool, optional): Whether to route requests through the SOCKS5 proxy given on the command line. Defaults to False.
+        resolved (list[str], optional): Hosts resolved ahead of time, as returned by preresolve_hosts. Defaults to None.
+
+    Returns:
+        dict[str, bytes]: The raw content of each page, keyed by URL. URLs that failed or answered with an error status are left out.
+    """
+    urls, retries, pages, attempts = iter(urls), [], {}, {}
+    def next_url():
+        # Only go to the network for pages that are not cached
+        for url in urls:
+            cached = read_cache(url, 'static')
+            if cached is None:
+                return url
+            pages[url] = cached
+        # Retry transient failures once their backoff has passed
+        due = [retry for retry in retries if retry[0] <= time.monotonic()]
+        if due:
+            retries.remove(min(due))
+            return min(due)[1]
+        return None
+    multi = pycurl.CurlMulti()
+    multi.setopt(pycurl.M_PIPELINING, pycurl.PIPE_MULTIPLEX)
+    handles, free, active = [], [], 0
+    try:
+        while True:
+            # Hand out URLs to idle handles, creating handles up to the concurrency limit
+            while active < CONCURRENCY:
+                url = next_url()
+                if url is None:
+                    break
+                if not free:
+                    handles.append(init_curl(proxy, resolved))
+                    free.append(handles[-1])
+                c = free.pop()
+                c.url, c.buffer = url, bytearray()
+                try:
+                    c.setopt(pycurl.URL, c.url)
+                except (pycurl.error, UnicodeError):
+                    # A URL libcurl cannot accept counts as a failed transfer
+                    free.append(c)
+                    continue
+                c.setopt(pycurl.WRITEFUNCTION, c.buffer.extend)
+                multi.add_handle(c)
+                active += 1
+            if active == 0:
+                if not retries:
+                    break
+                # Nothing is in flight, so sleep until the next retry is due
+                time.sleep(max(0, min(retries)[0] - time.monotonic()))
+                continue
+            # Let libcurl make progress on every active transfer
+            while multi.perform()[0] == pycurl.E_CALL_MULTI_PERFORM:
+                pass
+            # Collect finished transfers and free up their handles
+            while True:
+                num_queued, succeeded, failed = multi.info_read()
+                for c in succeeded + [c for c, _, _ in failed]:
+                    multi.remove_handle(c)
+                    free.append(c)
+                    active -= 1
+                    transient = c not in succeeded or c.getinfo(pycurl.RESPONSE_CODE) in RETRY_STATUSES
+                    if transient and attempts.get(c.url, 0) < RETRIES:
+                        # Back off exponentially before the URL is handed out again, as fetch_url_static does
+                        retries.append((time.monotonic() + BACKOFF * 2 ** attempts.get(c.url, 0), c.url))
+                        attempts[c.url] = attempts.get(c.url, 0) + 1
+                        continue
+                    # Error pages are dropped along with failed transfers, callers would mistake them for content
+                    if c in succeeded and c.getinfo(pycurl.RESPONSE_CODE) < 400:
+                        pages[c.url] = bytes(c.buffer)
+                        write_cache(c.url, 'static', pages[c.url])
+                if num_queued == 0:
+                    break
+            if active:
+                # Wait for socket activity, but no longer than libcurl's own timers or, while a handle is free, the next retry allow
+                timeout = multi.timeout()
+                wait = 1.0 if timeout < 0 else min(timeout / 1000, 1.0)
+                if retries and active < CONCURRENCY:
+                    wait = min(wait, max(0, min(retries)[0] - time.monotonic()))
+                multi.select(wait)
+    finally:
+        # Detach anything still in flight so every handle can be closed, even after an error
+        for c in handles:
+            if c not in free:
+                multi.remove_handle(c)
+            c.close()
+        multi.close()
+    return pages
 
 def fetch_url_dynamic(url: str, driver: webdriver.Chrome | webdriver.Firefox, source=False) -> str:
     """ Fetches the page content of a URL using  Selenium webdriver. Slower but can handle dynamic pages.
@@ -73,7 +356,12 @@ def fetch_url_dynamic(url: str, driver: webdriver.Chrome | webdriver.Firefox, so
     Returns:
         str: The content of the page.
     """
-    searching = True
+    # Listings depend on the load-more loop running to the end, so only rendered pages are cached
+    if not source:
+        cached = read_cache(url, 'dynamic')
+        if cached is not None:
+            return cached.decode('utf-8')
+    searching, cacheable = True, False
     driver.get(url)
     if source:
         wait = WebDriverWait(driver, 2)  # Wait up to 2 seconds
@@ -93,44 +381,118 @@ def fetch_url_dynamic(url: str, driver: webdriver.Chrome | webdriver.Firefox, so
             except TimeoutException:
                 # If the button is no longer present or not clickable within the timeout, break from the loop
                 searching = False
+    else:
+        try:
+            # Wait for the page to finish loading rather than sleeping a fixed amount
+            WebDriverWait(driver, 5).until(lambda d: d.execute_script('return document.readyState') == 'complete')
+            # Give scripts a moment to render the email or contact links the callers look for
+            WebDriverWait(driver, 2).until(EC.presence_of_element_located((By.CSS_SELECTOR, 'a[href*="@"], a[href*="contact"]')))
+            cacheable = True
+        except TimeoutException:
+            # If the page has no such links, return whatever has been rendered without caching it
+            pass
     page_source = driver.page_source
-    if not source:
-        time.sleep(3)
+    if cacheable:
+        write_cache(url, 'dynamic', page_source.encode('utf-8'))
     return page_source
 
-def get_links(soup: BeautifulSoup, target: str, newurl: str, international=False) -> list:
-    school_links = []
-    # Ensure we always have an iterable of elements, adjusting based on `international`
-    links = soup if international else soup.find_all('a')
+def parse_html(source: str | bytes) -> lxml_html.HtmlElement:
+    """ Parses page content into an lxml tree.
+
+    Args:
+        source (str | bytes): The content of the page.
+
+    Returns:
+        lxml_html.HtmlElement: The root element of the page.
+    """
+    try:
+        # lxml rejects str input carrying an XML encoding declaration, so hand it UTF-8 bytes instead
+        if isinstance(source, str):
+            return lxml_html.fromstring(source.encode('utf-8'), parser=UTF8_PARSER)
+        return lxml_html.fromstring(source)
+    except etree.ParserError:
+        # Empty pages have no document to parse
+        return lxml_html.fromstring('<html></html>')
+
+def absolute_url(base: str, href: str) -> str:
+    """ Resolve a scraped href against the page it was found on, encoding it so libcurl accepts it.
+
+    Args:
+        base (str): The URL of the page the link was found on.
+        href (str): The href of the link.
+
+    Returns:
+        str: The absolute, ASCII-only URL.
+    """
+    parts = urlsplit(urljoin(base, href.strip()))
+    # Internationalized host names are IDNA-encoded, everything else is percent-encoded
+    try:
+        netloc = parts.netloc if parts.netloc.isascii() else parts.netloc.encode('idna').decode('ascii')
+    except UnicodeError:
+        netloc = quote(parts.netloc, safe=URL_SAFE_CHARS)
+    return urlunsplit((parts.scheme, netloc, quote(parts.path, safe=URL_SAFE_CHARS), quote(parts.query, safe=URL_SAFE_CHARS), quote(parts.fragment, safe=URL_SAFE_CHARS)))
+
+def map_with_drivers(func, urls: list[str], drivers: list[webdriver.Firefox]):
+    """ Runs a Selenium scraping function over several URLs concurrently, one thread per webdriver.
+
+    Webdrivers are not thread-safe, so every call borrows a driver from the pool for its duration.
+
+    Args:
+        func (Callable): The function to run, called with a URL and a webdriver.
+        urls (list[str]): The URLs to process.
+        drivers (list[webdriver.Firefox]): The Selenium webdriver objects to share between the threads.
+
+    Yields:
+        The result of each call, in the order of the URLs.
+    """
+    idle = queue.Queue()
+    for driver in drivers:
+        idle.put(driver)
+    def run(url):
+        driver = idle.get()
+        try:
+            return func(url, driver)
+        finally:
+            idle.put(driver)
+    with ThreadPoolExecutor(max_workers=len(drivers)) as executor:
+        yield from executor.map(run, urls)
+
+def get_links(links, target: str, newurl: str) -> Iterator[str]:
+    seen = set()
     
-    for link in links:
-        if international:
-            link = link.find('a')
-        href = link.get('href')
-        if href and target in href:
-            school_links.append(href if international else newurl.replace("href", href))
-    return school_links
-
-def get_school_links(url: str, target: str, newurl: str, source=None, international=False) -> list[str]:
+    for href in links:
+        # Listings often link the same school more than once, so only keep the first occurrence
+        if href and target in href and href not in seen:
+            seen.add(href)
+            yield newurl.replace("href", href)
+
+def get_school_links(url: str, target: str, newurl: str, source=None, international=False, proxy=False) -> Iterator[str]:
     """ Get the links to the school pages from the main page.
 
     Args:
         url (str): The URL to fetch the content from.
         target (str): The target string to match in the href attribute.
         link (str): The link to append to the base URL.
-        source (str, optional): The page source. Defaults to None.
+        source (str | bytes, optional): The page source. Defaults to None.
+        international (bool, optional): Whether the page lists international schools. Defaults to False.
+        proxy (bool, optional): Whether to fetch the page through the SOCKS5 proxy given on the command line. Defaults to False.
 
     Returns:
-        list[str]: A list of the school page links.
+        Iterator[str]: The school page links, produced as the page is scanned.
     """
     if source is None:
-        source, _ = fetch_url_static(url)
-    soup = BeautifulSoup(source, 'html.parser')
+        source, _ = fetch_url_static(url, proxy=proxy)
     # If the page is for international schools, find the div with the cities and schools
     if international:
-        soup = soup.find('div', id='cities-schools').find_all('h3', class_='mb20')
+        links = INTERNATIONAL_LINKS_XPATH(parse_html(source))
+    # Otherwise only the hrefs are needed, which a regex pulls out without building the DOM
+    else:
+        if isinstance(source, str):
+            source = source.encode('utf-8')
+        # Only one of the double-quoted, single-quoted and unquoted groups matches
+        links = (unescape(b''.join(filter(None, match.groups())).decode('utf-8', errors='replace')) for match in HREF_RE.finditer(source))
         
-    return get_links(soup, target, newurl, international)
+    return get_links(links, target, newurl)
 
 def extract_emails_from_school_page(url: str, c=None, driver=None) -> tuple[set[str], pycurl.Curl | None]:
     """ Extracts emails from a school page.
@@ -148,14 +510,80 @@ def extract_emails_from_school_page(url: str, c=None, driver=None) -> tuple[set[
         html = fetch_url_dynamic(url, driver)
     else:
         html, curl = fetch_url_static(url, c)
-    soup = BeautifulSoup(html, 'html.parser')
-    for link in soup.find_all('a'):
-        href = link.get('href')
-        if href and '@' in href:
-            # Remove 'mailto:' from the email
+    return extract_emails_from_html(html), (None if driver else curl)
+
+def extract_emails_from_html(html: str | bytes) -> set[str] | None:
+    """ Extracts the contact email from the content of a school page.
+
+    Args:
+        html (str | bytes): The content of the page.
+
+    Returns:
+        set[str] | None: A set with the first email found on the page, or None if there is none.
+    """
+    encoding = None
+    if isinstance(html, str):
+        html, encoding = html.encode('utf-8'), 'utf-8'
+    # Most pages carry a plain mailto link, which a regex finds without building the DOM
+    match = MAILTO_RE.search(html)
+    if match:
+        return {match.group(1).decode('ascii')}
+    try:
+        # Parse incrementally and stop at the first anchor pointing to an address, skipping the rest of the page
+        for _, link in etree.iterparse(BytesIO(html), events=('start',), tag='a', html=True, encoding=encoding):
+            href = link.get('href')
+            if href and '@' in href:
+                # Remove 'mailto:' from the email
+                return {href.replace('mailto:', '')}
+    except etree.XMLSyntaxError:
+        # Empty pages have no document to parse
+        pass
+    return None
+
+def extract_emails_from_school_site(url: str, driver: webdriver.Chrome | webdriver.Firefox, proxy=False, resolved=None) -> tuple[set[str], bool]:
+    """ Extracts emails from an international school's website, preferring its contact pages over the homepage.
+
+    Args:
+        url (str): The URL of the school's website.
+        driver (webdriver.Chrome | webdriver.Firefox): The Selenium webdriver object to use.
+        proxy (bool, optional): Whether to route static requests through the SOCKS5 proxy given on the command line. Defaults to False.
+        resolved (list[str], optional): Hosts resolved ahead of time, as returned by preresolve_hosts. Defaults to None.
+
+    Returns:
+        tuple[set[str], bool]: A set of emails and whether the extraction failed.
+    """
+    emails, contact_url, failed_contact = set(), None, False
+    # Try to find a contacts page
+    tree = parse_html(fetch_url_dynamic(url, driver))
+    contact_urls = list(dict.fromkeys(absolute_url(url, href) for href in CONTACT_LINKS_XPATH(tree)))
+    # Skip mailto: and other non-web links that merely mention 'contact'
+    contact_urls = [contact_url for contact_url in contact_urls if urlsplit(contact_url).scheme in ('http', 'https')]
+    # Fetch the first few candidate contact pages concurrently, most of them don't need a browser
+    prefetched = fetch_urls_static(contact_urls[:CONTACT_PREFETCH], proxy, resolved)
+    for contact_url in contact_urls:
+        hrefs = CONTACT_EMAILS_XPATH(parse_html(prefetched[contact_url])) if contact_url in prefetched else []
+        if not any(EMAIL_RE.fullmatch(href.replace('mailto:', '')) for href in hrefs):
+            # Nothing usable in the static page, so let the browser render it
+            hrefs = CONTACT_EMAILS_XPATH(parse_html(fetch_url_dynamic(contact_url, driver)))
+        # Extract the first valid info email from the contact page
+        for href in hrefs:
+            address = href.replace('mailto:', '')
+            if EMAIL_RE.fullmatch(address):
+                emails.add(address)
+                failed_contact = False
+                break
+            else:
+                failed_contact = True
+        if not failed_contact:
+            break
+    # If there is no contact page, try extracting emails from the main page
+    if not contact_url or failed_contact:
+        for href in HOMEPAGE_EMAILS_XPATH(tree):
             email = href.replace('mailto:', '')
-            return {email}, (None if driver else curl)
-    return None, None if driver else curl
+            if EMAIL_RE.fullmatch(email):
+                emails.add(email)
+                failed_contact = False
+    return emails, failed_contact
 
 def main() -> None:
     """ Main function to run the email gathering bot.
@@ -167,109 +595,89 @@ def main() -> None:
     # Check if the user wants to use a proxy
     proxy = len(sys.argv) > 3
     # Initialize variables
-    curl, driver, page_source, all_emails = None, None, None, set()
+    driver, drivers, page_source, all_emails = None, [], None, set()
 
-    # Fetch emails for native public schools
-    if sys.argv[2].lower() == '-p':
-        print("Fetching links")
-        # Get the links to the school pages
-        if sys.argv[1].lower() == 'true':
+    try:
+        # Fetch emails for native public schools
+        if sys.argv[2].lower() == '-p':
+            print("Fetching links")
+            # Get the links to the school pages
+            if sys.argv[1].lower() == 'true':
+                driver = init_driver(proxy)
+                drivers = [driver]
+                page_source = fetch_url_dynamic(URL, driver, True)
+            school_links = get_school_links(URL, TARGET_PUBLIC, "https://scholenopdekaart.nlhrefcontact", page_source, proxy=proxy)
+            print("Fetching emails")
+            # Extract emails from the school pages, which are fetched concurrently unless Selenium is in use
+            if driver:
+                for _ in range(DRIVER_POOL_SIZE - 1):
+                    drivers.append(init_driver(proxy))
+                extract = lambda school_url, pooled_driver: extract_emails_from_school_page(school_url, driver=pooled_driver)
+                for emails, _ in map_with_drivers(extract, school_links, drivers):
+                    if emails:
+                        all_emails.update(emails)
+            else:
+                for html in fetch_urls_static(school_links, proxy).values():
+                    emails = extract_emails_from_html(html)
+                    if emails:
+                        all_emails.update(emails)
+        # Otherwise fetch emails for international schools
+        else:
+            print("Fetching lists")
+            failed, city_links, page_links, school_links, seen_links = set(), set(), set(), [], set()
+            # Initialize a Mozilla Firefox webdriver
             driver = init_driver(proxy)
-            page_source = fetch_url_dynamic(URL, driver, True)
-        school_links = get_school_links(URL, TARGET_PUBLIC, "https://scholenopdekaart.nlhrefcontact", page_source)
-        print("Fetching emails")
-        # Extract emails from the school pages
-        for school_url in school_links:
-            emails, curl = extract_emails_from_school_page(school_url, curl if all_emails else None, driver=driver)
-            if emails:
+            drivers = [driver]
+            # Fetch the page source
+            page_source = fetch_url_dynamic(f"https://www.international-schools-database.com/country/{COUNTRY.lower()}", driver, True)
+            # Get the links to the city pages
+            city_links.update(get_school_links("", TARGET_INTERNATIONAL, "href", page_source, True))
+            print("Fetching Pages")
+            # Get the links to the school pages
+            for city_url in city_links:
+                city_source = fetch_url_dynamic(city_url, driver, True)
+                # Find the links of all elements that have a 'data-id' attribute
+                page_links.update(href for href in DATA_ID_LINKS_XPATH(parse_html(city_source)) if href)
+            print("Fetching links")
+            # Get the links to the school websites, fetching the school pages concurrently
+            for page_source in fetch_urls_static(page_links, proxy).values():
+                hrefs = SCHOOL_WEBPAGE_XPATH(parse_html(page_source))
+                if hrefs:
+                    href_value = hrefs[0]
+                    # Remove the refferal part of the URL
+                    if '?' in href_value:
+                        href_value = href_value.split('?')[0]
+                    # Schools with several campuses list the same website more than once
+                    if href_value not in seen_links:
+                        seen_links.add(href_value)
+                        school_links.append(href_value)
+            # Visit the schools in a stable order, keeping pages on the same host next to each other
+            school_links.sort(key=lambda link: (urlparse(link).netloc, link))
+            # Resolve every school's host at once, unless the proxy is meant to do the lookups
+            resolved = None if proxy else preresolve_hosts(school_links)
+            print("Fetching emails")
+            # Extract emails from the school pages, spreading the schools over a pool of webdrivers
+            for _ in range(DRIVER_POOL_SIZE - 1):
+                drivers.append(init_driver(proxy))
+            extract = lambda school_url, pooled_driver: extract_emails_from_school_site(school_url, pooled_driver, proxy, resolved)
+            results = map_with_drivers(extract, school_links, drivers)
+            for i, (url, (emails, failed_school)) in enumerate(zip(school_links, results), 1):
+                if i % 10 == 0:
+                    print(f"Processed {i}/{len(school_links)} schools")
                 all_emails.update(emails)
-    # Otherwise fetch emails for international schools
-    else:
-        print("Fetching lists")
-        failed, city_links, page_links, school_links = set(), set(), set(), []
-        # Initialize a Mozilla Firefox webdriver
-        driver = init_driver(proxy)
-        # Fetch the page source
-        page_source = fetch_url_dynamic(f"https://www.international-schools-database.com/country/{COUNTRY.lower()}", driver, True)
-        # Get the links to the city pages
-        city_links.update(get_school_links("", TARGET_INTERNATIONAL, "href", page_source, True))
-        print("Fetching Pages")
-        # Get the links to the school pages
-        for city_url in city_links:
-            city_source = fetch_url_dynamic(city_url, driver, True)
-            soup = BeautifulSoup(city_source, 'html.parser')
-            # Function to check if an element has a 'data-id' attribute
-            def has_data_id(tag):
-                return tag.has_attr('data-id')
-            # Find all elements that have a 'data-id' attribute
-            elements = soup.find_all(has_data_id)
-            for element in elements:
-                page_links.add(element.get('href'))
-        print("Fetching links")
-        # Get the links to the school websites
-        for link in page_links:
-            soup = BeautifulSoup(fetch_url_dynamic(link, driver), 'html.parser')
-            a_tag = soup.find('a', title="School's webpage")
-            if a_tag:
-                href_value = a_tag['href']
-                # Remove the refferal part of the URL
-                if '?' in href_value:
-                    href_value = href_value.split('?')[0]
-                school_links.append(href_value)
-        print("Fetching emails")
-        # Extract emails from the school pages
-        for url in school_links:
-            contact_url, failed_contact = None, False
-            # Try to find a contacts page
-            soup = BeautifulSoup(fetch_url_dynamic(url, driver), 'html.parser')
-            for link in soup.find_all('a'):
-                href = link.get('href')
-                if href and 'contact' in href:
-                    contact_url = href if 'http' in href else url + href
-                    print(contact_url)
-                    # Extract emails from the contact page
-                    soup2 = BeautifulSoup(fetch_url_dynamic(contact_url, driver), 'html.parser')
-                    # Define a function to use as a filter for info emails
-                    def has_at_in_href(tag):
-                        return tag.name == 'a' and tag.has_attr('href') and any(i in tag['href'] for i in ['info', 'contact', 'dir', 'administration']) and all(g not in tag['href'] for g in ['recru', 'www', 'office'])
-                    emails = soup2.find_all(has_at_in_href)
-                    for email in emails:
-                        if email and re.match(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$", email['href'].replace('mailto:', '')):
-                            all_emails.add(email['href'].replace('mailto:', ''))
-                            failed_contact = False
-                            break
-                        else:
-                            failed_contact = True
-                    if not failed_contact:
-                        break
-            # If there is no contact page, try extracting emails from the main page
-            if not contact_url or failed_contact:
-                # Define a function to use as a filter
-                def has_at_in_href(tag):
-                    return tag.name == 'a' and tag.has_attr('href') and '@' in tag['href'] and all(g not in tag['href'] for g in ['recru', 'www'])
-                a_tags = soup.find_all(has_at_in_href)
-                for a_tag in a_tags:
-                    email = a_tag['href'].replace('mailto:', '')
-                    if re.match(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$", email):
-                        all_emails.add(email)
-                        failed_contact = False
-                if failed_contact:
+                if failed_school:
                     failed.add(url)
-        # Write the failed URLs to a file
-        with open('failed.txt', 'w') as file:
-            for url in sorted(failed):
-                file.write(f"{url}\n")
-
-    # Close the pycurl object or the Selenium webdriver
-    if curl:
-        curl.close()
-    elif driver:
-        driver.quit()
+            # Write the failed URLs to a file
+            with open('failed.txt', 'w') as file:
+                file.write(''.join(f"{url}\n" for url in sorted(failed)))
+    finally:
+        # Close every Selenium webdriver started so far, pycurl handles are closed by the fetchers themselves
+        for driver in drivers:
+            driver.quit()
 
     # Save the emails to a file
     with open('emails.txt', 'w') as file:
-        for email in sorted(all_emails):
-            file.write(f"{email}\n")
+        file.write(''.join(f"{email}\n" for email in sorted(all_emails)))
     print(f"Emails extracted and saved to emails.txt")
 
 if __name__ == '__main__':